@@ -5,6 +5,7 @@ Sidebar: Sandi Bot chat, customer entry. Backend logic unchanged.
 """
 import sys
 import streamlit as st
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -13,11 +14,10 @@ if sys_path not in sys.path:
     sys.path.insert(0, sys_path)
 
 import database
-import synthetic_data
-import ml_models
 import sandi_bot
-import natural_sandi_bot
 import roi_calculator
+import queue
+import threading
 from datetime import datetime, timezone
 from components import (
     render_sandi_avatar,
@@ -37,7 +37,6 @@ from components import (
     first_name_only,
     action_color,
     COACHING_CSS,
-    HEADER_CSS,
     COLORS,
 )
 
@@ -47,8 +46,10 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded",
 )
+# HEADER_CSS is a legacy alias of COACHING_CSS; one emission covers both.
 st.markdown(COACHING_CSS, unsafe_allow_html=True)
-st.markdown(HEADER_CSS, unsafe_allow_html=True)
+# Components skip their fallback CSS injection when the app has already emitted it.
+st.session_state["_sandi_css_injected"] = True
 
 # ---- Global styling ----
 st.markdown("""
@@ -88,16 +89,113 @@ if "roi_celebration_shown_10hr" not in st.session_state:
     st.session_state.roi_celebration_shown_10hr = False
 
 
+COMPARTMENT_ORDER = ["Discovery", "Exploration", "Serious Consideration", "Decision Prep", "Commitment"]
+SCORE_KEYS = ("identity_score", "commitment_score", "financial_score", "execution_score")
+
+
+@st.cache_data(ttl=300)
+def _get_prospects():
+    """All prospects from the DB. Cached so reruns don't re-query SQLite."""
+    return database.get_all_prospects()
+
+
+@st.cache_resource
+def _get_ml_model(prospects_fingerprint: tuple):
+    """Fitted ML model. Rebuilt only when the prospect set changes."""
+    import ml_models  # deferred: pulls in sklearn, only needed to (re)fit
+
+    return ml_models.build_and_fit_ml(_get_prospects())
+
+
 def load_data():
-    synthetic_data.ensure_synthetic_data()
-    st.session_state.prospects = database.get_all_prospects()
-    st.session_state.ml_model = ml_models.build_and_fit_ml(st.session_state.prospects)
+    # Seed at most once per session; ensure_synthetic_data() otherwise does a
+    # full-table count on every start-session click.
+    if not st.session_state.get("data_seeded"):
+        import synthetic_data  # deferred: only needed to seed an empty DB
+
+        synthetic_data.ensure_synthetic_data()
+        st.session_state.data_seeded = True
+    prospects = _get_prospects()
+    st.session_state.prospects = prospects
+    st.session_state.ml_model = _get_ml_model(tuple(p["prospect_id"] for p in prospects))
+    st.session_state.prospect_index = {p["prospect_id"]: p for p in prospects}
+    st.session_state.prospect_id_options = tuple(p["prospect_id"] for p in prospects)
+    st.session_state.prospect_first_names = [first_name_only(p.get("name")) for p in prospects]
+    # SoA view of the four readiness scores: render code indexes one float row
+    # per prospect instead of re-walking the dict on every rerun.
+    st.session_state.scores_matrix = np.array(
+        [[p.get(k) or 0 for k in SCORE_KEYS] for p in prospects], dtype=np.float32
+    ) if prospects else np.zeros((0, len(SCORE_KEYS)), dtype=np.float32)
+    st.session_state.row_idx = {p["prospect_id"]: i for i, p in enumerate(prospects)}
+    st.session_state.neighbor_index = st.session_state.ml_model.build_neighbor_index(prospects, top_n=9)
+    # Cache the DataFrame and Insights aggregations here so reruns (every chat
+    # message or widget click re-executes the script) don't rebuild them.
+    df = pd.DataFrame(prospects) if prospects else pd.DataFrame()
+    if not df.empty:
+        # Categorical codes make groupby/value_counts hash small ints, not Python strings.
+        df["persona"] = df["persona"].astype("category")
+        df["compartment"] = df["compartment"].astype("category")
+    st.session_state.df = df
+    st.session_state.compartment_days_arr = (
+        df["compartment_days"].fillna(0).to_numpy(dtype=np.float64)
+        if "compartment_days" in df.columns else np.zeros(0)
+    )
+    if not df.empty:
+        st.session_state.by_comp = df["compartment"].value_counts().reindex(COMPARTMENT_ORDER).fillna(0)
+        st.session_state.by_persona = df["persona"].value_counts()
+    else:
+        st.session_state.by_comp = pd.Series(dtype=float)
+        st.session_state.by_persona = pd.Series(dtype=int)
+
+
+def _plotly_go():
+    """plotly.graph_objects, imported once per session; None if unavailable."""
+    go = st.session_state.get("_plotly_go")
+    if go is None:
+        try:
+            import plotly.graph_objects as go
+        except ImportError:
+            go = False
+        st.session_state._plotly_go = go
+    return go or None
+
+
+def _prospect_sig(p: dict) -> tuple:
+    """Hashable signature of the fields get_recommendation reads, for cache keys."""
+    return (
+        p.get("persona"), p.get("compartment"), p.get("compartment_days"),
+        p.get("identity_score"), p.get("commitment_score"),
+        p.get("financial_score"), p.get("execution_score"),
+        p.get("conversion_probability"), tuple(p.get("red_flags") or ()),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _insights_aggregates(df: pd.DataFrame) -> dict:
+    """Insights-tab aggregations; recomputed only when the DataFrame changes."""
+    comp_means = df.groupby("compartment", observed=True, sort=False)[list(SCORE_KEYS)].mean()
+    comp_means["avg"] = comp_means.mean(axis=1)
+    comp_means = comp_means.reindex(COMPARTMENT_ORDER).dropna(how="all")
+    # One pass over compartment_days: group on the Overthinker/other split
+    # instead of materializing two filtered frames.
+    day_means = df.groupby(df["persona"].eq("Overthinker"))["compartment_days"].mean()
+    return {
+        "comp_means": comp_means,
+        "overthinker_avg": day_means.get(True, 0),
+        "other_avg": day_means.get(False, 0),
+        "has_burning_bridge": bool((df["persona"] == "Burning Bridge").any()),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _cached_recommendation(prospect_id: str, sig: tuple):
+    """(action, confidence, reason) for one prospect, reused across reruns."""
+    return sandi_bot.get_recommendation(st.session_state.prospect_index[prospect_id])
 
 
 def on_start_session(prospect_id: str, name: str):
     """Load prospect into session. Do not set sandi_customer_id/sandi_customer_name here (widget keys)."""
-    load_data()
-    prospect = database.get_prospect(prospect_id)
+    prospect = st.session_state.get("prospect_index", {}).get(prospect_id)
     if prospect:
         st.session_state.current_prospect = prospect
         st.session_state.sandi_prospect_id = prospect_id
@@ -115,38 +213,40 @@ def on_select_prospect(prospect_id: str):
     st.session_state.goto_tab_index = 2  # Coaching Session
 
 def _parse_iso(s: str):
+    # Fast path: the app writes these itself via datetime.isoformat(), which
+    # fromisoformat parses directly (Python 3.11+ also accepts a "Z" suffix).
     if not s:
         return datetime.now(timezone.utc)
-    s = s.replace("Z", "+00:00")
     try:
         return datetime.fromisoformat(s)
-    except Exception:
+    except ValueError:
         return datetime.now(timezone.utc)
 
 
 def _record_time_and_outcome(prospect_id: str, activity_type: str, baseline_key: str):
     """Stop ROI timer, record time_tracking and outcome, update weekly_roi, show delights."""
-    now = datetime.now(timezone.utc).isoformat()
+    now_dt = datetime.now(timezone.utc)  # one clock read reused below
+    now = now_dt.isoformat()
     start = st.session_state.get("roi_timer_start")
     st.session_state.roi_timer_start = None
     st.session_state.roi_timer_prospect_id = None
     if not start:
         return
     start_dt = _parse_iso(start)
-    end_dt = datetime.now(timezone.utc)
-    duration_seconds = max(0, (end_dt - start_dt).total_seconds())
+    duration_seconds = max(0, (now_dt - start_dt).total_seconds())
     baseline_seconds = roi_calculator.BASELINE_SECONDS.get(baseline_key, roi_calculator.BASELINE_SECONDS["per_client_session"])
     time_saved_seconds = roi_calculator.time_saved_for_session(baseline_key, duration_seconds)
-    database.insert_time_tracking(prospect_id, activity_type, start, now, duration_seconds, baseline_seconds, time_saved_seconds)
-    if activity_type == "mark_contacted":
-        database.insert_outcome(prospect_id, "contacted", 1)
-        if database.get_outcomes_count("contacted") == 1:
-            st.balloons()
-            st.success("First win! You marked your first client as contacted.")
-    week_start = roi_calculator.get_week_start(datetime.now(timezone.utc))
-    total_hr = database.get_time_saved_total()
-    contacted = database.get_outcomes_count("contacted")
-    advanced = database.get_outcomes_count("advancement")
+    totals = database.record_session_activity(
+        prospect_id, activity_type, start, now, duration_seconds, baseline_seconds, time_saved_seconds,
+        outcome_type="contacted" if activity_type == "mark_contacted" else None,
+    )
+    total_hr = totals["total_hours"]
+    contacted = totals["contacted"]
+    advanced = totals["advanced"]
+    if activity_type == "mark_contacted" and contacted == 1:
+        st.balloons()
+        st.success("First win! You marked your first client as contacted.")
+    week_start = roi_calculator.get_week_start(now_dt)
     rev = roi_calculator.revenue_projection(total_hr, contacted, advanced)
     database.upsert_weekly_roi(week_start, time_saved_hours=total_hr, revenue_projection=rev, clients_contacted=contacted, clients_advanced=advanced)
     if total_hr >= 1:
@@ -154,13 +254,73 @@ def _record_time_and_outcome(prospect_id: str, activity_type: str, baseline_key:
     if total_hr >= 10 and not st.session_state.get("roi_celebration_shown_10hr"):
         st.session_state.roi_celebration_shown_10hr = True
         st.success("🍷 Go get some wine, you've earned it! You've saved **10+ hours**.")
-    usage_dates = database.get_usage_dates()
-    consecutive = roi_calculator.get_consecutive_usage_days(usage_dates)
+    consecutive = roi_calculator.get_consecutive_usage_days(totals["usage_dates"])
     if consecutive >= 5:
         st.toast("You're building a powerful habit 💪")
 
 
-if not st.session_state.prospects:
+@st.cache_resource
+def _chat_write_queue() -> queue.Queue:
+    """Background chat writer: one daemon thread per process drains the queue.
+
+    Keeps the SQLite commit off the user-perceived chat path; the UI updates
+    immediately and the write happens in the background.
+    """
+    q = queue.Queue()
+
+    def _worker():
+        while True:
+            rows = q.get()
+            try:
+                database.insert_chat_messages(rows)
+            except Exception:
+                pass
+            finally:
+                q.task_done()
+
+    threading.Thread(target=_worker, daemon=True).start()
+    return q
+
+
+@st.fragment
+def render_sidebar_chat(prospect_id: str):
+    """Sidebar chat. Runs as a fragment so sending a message reruns only this block, not the whole script."""
+    st.subheader("Chat with Sandi")
+    # Bound per-rerun widget count: render the last 20 bubbles, park the rest
+    # behind an expander so long sessions don't grow the rerun cost.
+    older = st.session_state.chat_messages[:-20]
+    recent = st.session_state.chat_messages[-20:]
+    if older:
+        with st.expander(f"Show {len(older)} older messages"):
+            for msg in older:
+                st.chat_message("user" if msg.get("role") == "user" else "assistant").write(msg.get("content", ""))
+    for msg in recent:
+        role = msg.get("role", "assistant")
+        content = msg.get("content", "")
+        if role == "user":
+            st.chat_message("user").write(content)
+        else:
+            st.chat_message("assistant").write(content)
+    user_input = st.chat_input("Ask Sandi...")
+    if user_input:
+        import natural_sandi_bot  # deferred: only needed once a message is sent
+
+        current = st.session_state.current_prospect
+        st.session_state.chat_messages.append({"role": "user", "content": user_input})
+        response = natural_sandi_bot.simple_chat_response(user_input, prospect=current, history=st.session_state.chat_messages[:-1])
+        st.session_state.chat_messages.append({"role": "assistant", "content": response})
+        # Render the new turn in place; the history loop above picks it up from
+        # session state on the next natural rerun, so no rerun is needed here.
+        st.chat_message("user").write(user_input)
+        st.chat_message("assistant").write(response)
+        if prospect_id:
+            _chat_write_queue().put([
+                {"prospect_id": prospect_id, "role": "user", "message": user_input},
+                {"prospect_id": prospect_id, "role": "assistant", "message": response},
+            ])
+
+
+if not st.session_state.prospects or "df" not in st.session_state:
     load_data()
 
 # Apply tab switch requested by "View full profile" (cannot set main_tab inside button callback)
@@ -168,13 +328,14 @@ tab_names = ["How to use", "Today's Dashboard", "Coaching Session", "People Like
 if "goto_tab_index" in st.session_state:
     idx = st.session_state.goto_tab_index
     del st.session_state.goto_tab_index
+    # The radio hasn't been instantiated yet this run, so setting its key here
+    # is enough — no extra st.rerun() pass is needed.
     st.session_state.main_tab = tab_names[idx]
     st.session_state.active_tab = idx
-    st.rerun()
 
 prospects = st.session_state.prospects
 ml_model = st.session_state.ml_model
-df = pd.DataFrame(prospects) if prospects else pd.DataFrame()
+df = st.session_state.df
 
 # ---- Sidebar ----
 with st.sidebar:
@@ -191,22 +352,7 @@ with st.sidebar:
         if sid or sname:
             st.markdown(f"**Current session:** {sid} · **{sname}**")
     st.divider()
-    st.subheader("Chat with Sandi")
-    for msg in st.session_state.chat_messages:
-        role = msg.get("role", "assistant")
-        content = msg.get("content", "")
-        if role == "user":
-            st.chat_message("user").write(content)
-        else:
-            st.chat_message("assistant").write(content)
-    user_input = st.chat_input("Ask Sandi...")
-    if user_input:
-        st.session_state.chat_messages.append({"role": "user", "content": user_input})
-        response = natural_sandi_bot.simple_chat_response(user_input, prospect=current, history=st.session_state.chat_messages[:-1])
-        st.session_state.chat_messages.append({"role": "assistant", "content": response})
-        database.insert_chat_message(prospect_id, "user", user_input)
-        database.insert_chat_message(prospect_id, "assistant", response, None)
-        st.rerun()
+    render_sidebar_chat(prospect_id)
 
 # ---- Main: tab selector (radio; switch via goto_tab_index from "View full profile") ----
 if "main_tab" not in st.session_state:
@@ -252,7 +398,7 @@ if selected_tab == "How to use":
       - **💡 Need Nurturing** – number where it suggests NURTURE (keep engaging, assign homework).
       - **⚠️ Stuck >21 days** – clients in Exploration for more than 21 days (may need a nudge or pause).
     - **View:** Choose **Pipeline (by stage)** or **Priority stack**.
-      - **Pipeline (by stage):** Five columns (Discovery → … → Commitment). Each client has a **View** button; click it to open their Coaching Session.
+      - **Pipeline (by stage):** Five columns (Discovery → … → Commitment). Pick a client in a column's **View profile…** box to open their Coaching Session.
       - **Priority stack:** List of PUSH + NURTURE clients, sorted by time in stage. Each card has **👁️ View full profile** – click to go to Coaching Session for that client.
     - **Show today's priorities only:** Check this to hide PAUSE clients and focus on people to act on.
     """)
@@ -329,10 +475,14 @@ elif selected_tab == "Today's Dashboard":
     if df.empty:
         st.info("No clients loaded. Data will load automatically.")
     else:
+        # One recommendation per prospect per rerun; counts and the render loop
+        # below all reuse this dict instead of re-calling get_recommendation.
+        actions = {p["prospect_id"]: _cached_recommendation(p["prospect_id"], _prospect_sig(p))[0] for p in prospects}
         # Metric cards: PUSH count, NURTURE count, Stuck >21 days in Exploration
-        push_count = sum(1 for p in prospects if sandi_bot.get_recommendation(p)[0] == "PUSH")
-        nurture_count = sum(1 for p in prospects if sandi_bot.get_recommendation(p)[0] == "NURTURE")
-        stuck_count = sum(1 for p in prospects if p.get("compartment") == "Exploration" and (p.get("compartment_days") or 0) > 21)
+        action_counts = pd.Series(actions).value_counts()
+        push_count = int(action_counts.get("PUSH", 0))
+        nurture_count = int(action_counts.get("NURTURE", 0))
+        stuck_count = int(((df["compartment"] == "Exploration") & (df["compartment_days"].fillna(0) > 21)).sum())
         m1, m2, m3 = st.columns(3)
         with m1:
             render_insight_metric(push_count, "🎯 Ready for Decision", key="met1")
@@ -341,7 +491,17 @@ elif selected_tab == "Today's Dashboard":
         with m3:
             render_insight_metric(stuck_count, "⚠️ Stuck >21 days", key="met3")
         def get_action(p):
-            return sandi_bot.get_recommendation(p)[0]
+            return actions[p["prospect_id"]]
+
+        def priority_list():
+            """PUSH/NURTURE prospects, longest time in stage first (numpy argsort)."""
+            days = st.session_state.compartment_days_arr
+            mask = np.fromiter(
+                (actions[p["prospect_id"]] in ("PUSH", "NURTURE") for p in prospects),
+                dtype=bool, count=len(prospects),
+            )
+            idxs = np.nonzero(mask)[0]
+            return [prospects[i] for i in idxs[np.argsort(-days[idxs], kind="stable")]]
         view_mode = st.radio(
             "View",
             ["Pipeline (by stage)", "Priority stack"],
@@ -351,8 +511,7 @@ elif selected_tab == "Today's Dashboard":
         st.session_state.show_priorities_only = st.checkbox("Show today's priorities only (PUSH + NURTURE)", value=st.session_state.show_priorities_only, key="prio_only")
         if view_mode == "Priority stack":
             # Stacked cards: PUSH + NURTURE only, sorted by urgency (days in stage desc)
-            stack_list = [p for p in prospects if get_action(p) in ("PUSH", "NURTURE")]
-            stack_list.sort(key=lambda p: (p.get("compartment_days") or 0), reverse=True)
+            stack_list = priority_list()
             st.caption("People ready for a decision or who need nurturing. Sorted by time in current stage (longest first).")
             for p in stack_list:
                 action = get_action(p)
@@ -361,8 +520,7 @@ elif selected_tab == "Today's Dashboard":
         else:
             # Kanban: 5 columns by stage
             if st.session_state.show_priorities_only:
-                show_list = [p for p in prospects if get_action(p) in ("PUSH", "NURTURE")]
-                show_list.sort(key=lambda p: (p.get("compartment_days") or 0), reverse=True)
+                show_list = priority_list()
             else:
                 show_list = prospects
             render_pipeline_kanban(show_list, get_action, on_select_prospect, key_prefix="dash_kanban")
@@ -375,9 +533,9 @@ elif selected_tab == "Coaching Session":
         sel_id = st.session_state.selected_prospect
         if not sel_id:
             sel_id = prospects[0].get("prospect_id")
-        options = [p["prospect_id"] for p in prospects]
-        labels = [first_name_only(p.get("name")) for p in prospects]
-        default_ix = options.index(sel_id) if sel_id and sel_id in options else 0
+        options = st.session_state.prospect_id_options
+        labels = st.session_state.prospect_first_names
+        default_ix = st.session_state.row_idx.get(sel_id, 0) if sel_id else 0
         choice_idx = st.selectbox(
             "Select client",
             range(len(options)),
@@ -387,7 +545,7 @@ elif selected_tab == "Coaching Session":
         )
         sel_id = options[choice_idx] if choice_idx is not None else None
     if prospects and sel_id:
-        p = database.get_prospect(sel_id)
+        p = st.session_state.prospect_index.get(sel_id)
         if p:
             # Start ROI timer when opening this client card (or restart if switched client)
             if st.session_state.roi_timer_prospect_id != sel_id or not st.session_state.roi_timer_start:
@@ -404,7 +562,7 @@ elif selected_tab == "Coaching Session":
                 st.caption(f"Last interaction: {p.get('last_interaction_date', '—')}. Ready for next step: {int(round(float(p.get('conversion_probability', 0)) * 100))}%")
             with right:
                 st.markdown("**Today's playbook**")
-                action, conf, reason = sandi_bot.get_recommendation(p)
+                action, conf, reason = _cached_recommendation(sel_id, _prospect_sig(p))
                 conf_pct = int(round(conf * 100))
                 st.progress(conf_pct / 100.0)
                 st.caption(f"Confidence: {conf_pct}%")
@@ -417,20 +575,21 @@ elif selected_tab == "Coaching Session":
                     if len(tactics) > 2:
                         render_script_box("Closing / homework", tactics[2], "tab2_close")
                 st.markdown("**Readiness**")
-                for label, key, note in [
+                score_row = st.session_state.scores_matrix[st.session_state.row_idx[sel_id]]
+                for j, (label, key, note) in enumerate([
                     ("Identity", "identity_score", "Ownership vs blame"),
                     ("Commitment", "commitment_score", "Ability to decide"),
                     ("Financial", "financial_score", "Comfort with money"),
                     ("Execution", "execution_score", "Follow-through"),
-                ]:
-                    render_score_visual(p.get(key, 0), label, note, f"tab2_{key}")
+                ]):
+                    render_score_visual(int(score_row[j]), label, note, f"tab2_{key}")
                 def on_up():
                     database.insert_feedback(p["prospect_id"], action, 1)
                     st.toast("Thanks! Feedback recorded.")
                 def on_down():
                     database.insert_feedback(p["prospect_id"], action, 0)
                     st.toast("Thanks! We'll improve.")
-                render_recommendation_card(action, reason, script=tactics[0] if tactics else None, confidence=conf, on_thumbs_up=on_up, on_thumbs_down=on_down, key_prefix="tab2_rec")
+                render_recommendation_card(action, reason, script=tactics[0] if tactics else None, confidence=conf, on_thumbs_up=on_up, on_thumbs_down=on_down, key_prefix=f"tab2_rec_{sel_id}")
                 st.caption("👍 👎 Your feedback is saved to improve future recommendations. It does not change the readiness bars or confidence above—those are based on this client's data.")
                 st.markdown("---")
                 st.caption("Quick actions (these record time saved and outcomes):")
@@ -450,16 +609,17 @@ elif selected_tab == "People Like Them":
     if not prospects or not ml_model:
         st.info("Load clients first.")
     else:
-        ref_options = [p["prospect_id"] for p in prospects]
-        ref_labels = [first_name_only(p.get("name")) for p in prospects]
+        ref_options = st.session_state.prospect_id_options
+        ref_labels = st.session_state.prospect_first_names
         ref_idx = st.selectbox("Find people similar to...", range(len(ref_options)), format_func=lambda i: ref_labels[i], key="tab3_ref")
         ref_id = ref_options[ref_idx]
-        ref = database.get_prospect(ref_id)
+        ref = st.session_state.prospect_index.get(ref_id)
         if ref:
-            similar = ml_model.get_similar_prospects(prospects, ref, top_n=9)
+            index = st.session_state.prospect_index
+            similar = [index[pid] for pid in st.session_state.neighbor_index.get(ref_id, []) if pid in index]
             st.subheader(f"People like {first_name_only(ref.get('name'))}")
             # Hero card
-            action_r = sandi_bot.get_recommendation(ref)[0]
+            action_r = _cached_recommendation(ref_id, _prospect_sig(ref))[0]
             with st.container():
                 st.markdown(f"**{ref.get('name')}** · {ref.get('persona')} · Stage: {ref.get('compartment')} · {ref.get('compartment_days', 0)} days")
                 if st.button("👁️ View full profile", key="tab3_hero"):
@@ -468,19 +628,22 @@ elif selected_tab == "People Like Them":
             st.markdown("---")
             # Grid of similar (3 columns)
             cols = st.columns(3)
-            for i, sim in enumerate(similar):
+            sim_rows = [
+                (first_name_only(s.get("name")), s.get("persona"), s.get("compartment"), s.get("prospect_id"))
+                for s in similar
+            ]
+            for i, (first, sim_persona, sim_comp, sim_pid) in enumerate(sim_rows):
                 with cols[i % 3]:
-                    first = first_name_only(sim.get("name"))
-                    st.markdown(f"**{first}** · {sim.get('persona')} · Stage: {sim.get('compartment')}")
-                    st.caption(f"Both {sim.get('persona')} in stage: {sim.get('compartment')}")
-                    if st.button("View profile", key=f"tab3_sim_{sim.get('prospect_id')}_{i}"):
-                        on_select_prospect(sim["prospect_id"])
+                    st.markdown(f"**{first}** · {sim_persona} · Stage: {sim_comp}")
+                    st.caption(f"Both {sim_persona} in stage: {sim_comp}")
+                    if st.button("View profile", key=f"tab3_sim_{sim_pid}_{i}"):
+                        on_select_prospect(sim_pid)
                         st.rerun()
             st.markdown("---")
             # Insight box
             persona = ref.get("persona", "Strategic")
             comp = ref.get("compartment", "Discovery")
-            tactics = sandi_bot.get_tactics(persona, sandi_bot.get_recommendation(ref)[0])
+            tactics = sandi_bot.get_tactics(persona, action_r)
             insight = f"**Pattern:** {persona} in {comp} often respond well to: *{tactics[0][:80]}...*" if tactics else f"Focus on one clear next step for {persona} in {comp}."
             st.info(insight)
 
@@ -489,40 +652,39 @@ elif selected_tab == "Insights":
     if df.empty:
         st.info("Load clients to see insights.")
     else:
-        comp_order = ["Discovery", "Exploration", "Serious Consideration", "Decision Prep", "Commitment"]
-        by_comp = df.groupby("compartment", sort=False).size().reindex(comp_order).fillna(0)
-        by_persona = df.groupby("persona").size()
+        comp_order = COMPARTMENT_ORDER
+        by_comp = st.session_state.by_comp
+        by_persona = st.session_state.by_persona
+        agg = _insights_aggregates(df)
         c1, c2 = st.columns(2)
         with c1:
             st.subheader("Where people get stuck (by stage)")
-            try:
-                import plotly.graph_objects as go
+            go = _plotly_go()
+            if go:
                 fig = go.Figure(go.Bar(x=by_comp.index, y=by_comp.values, marker_color=COLORS["accent"]))
                 fig.update_layout(height=280, margin=dict(t=20, b=60), xaxis_tickangle=-45)
                 st.plotly_chart(fig, use_container_width=True, key="insight_bar")
-            except Exception:
+            else:
                 st.write(by_comp)
         with c2:
             st.subheader("Persona distribution")
-            try:
-                import plotly.graph_objects as go
+            go = _plotly_go()
+            if go:
                 fig = go.Figure(go.Pie(labels=by_persona.index, values=by_persona.values, hole=0.5))
                 fig.update_layout(height=280, margin=dict(t=20))
                 st.plotly_chart(fig, use_container_width=True, key="insight_pie")
-            except Exception:
+            else:
                 st.write(by_persona)
         c3, c4 = st.columns(2)
         with c3:
             st.subheader("Success indicators (avg readiness by stage)")
-            try:
-                import plotly.graph_objects as go
-                comp_means = df.groupby("compartment")[["identity_score", "commitment_score", "financial_score", "execution_score"]].mean()
-                comp_means["avg"] = comp_means.mean(axis=1)
-                comp_means = comp_means.reindex(comp_order).dropna(how="all")
+            go = _plotly_go()
+            if go:
+                comp_means = agg["comp_means"]
                 fig = go.Figure(go.Bar(x=comp_means.index, y=comp_means["avg"].values, marker_color=COLORS["push"]))
                 fig.update_layout(height=260, margin=dict(t=20, b=80), xaxis_tickangle=-45)
                 st.plotly_chart(fig, use_container_width=True, key="insight_adv")
-            except Exception:
+            else:
                 st.write("—")
         with c4:
             st.subheader("This week's momentum")
@@ -530,20 +692,18 @@ elif selected_tab == "Insights":
             st.write(by_comp)
         st.markdown("---")
         st.subheader("Sandi's insights")
-        overthinker_avg = df[df["persona"] == "Overthinker"]["compartment_days"].mean() if "Overthinker" in df["persona"].values else 0
-        other_avg = df[df["persona"] != "Overthinker"]["compartment_days"].mean() if len(df[df["persona"] != "Overthinker"]) else 0
-        insight1 = "Overthinkers tend to stay in Exploration longer than others. Assign one clear homework and a short follow-up." if overthinker_avg > other_avg else "Spread across personas is balanced. Focus on Ready for Decision first."
-        burning = df[df["persona"] == "Burning Bridge"]
-        insight2 = "Most of your Burning Bridge clients move fast; watch for those who pause at Decision Prep." if len(burning) else ""
+        insight1 = "Overthinkers tend to stay in Exploration longer than others. Assign one clear homework and a short follow-up." if agg["overthinker_avg"] > agg["other_avg"] else "Spread across personas is balanced. Focus on Ready for Decision first."
+        insight2 = "Most of your Burning Bridge clients move fast; watch for those who pause at Decision Prep." if agg["has_burning_bridge"] else ""
         st.markdown(f"- {insight1}")
         if insight2:
             st.markdown(f"- {insight2}")
 
 # ---- Tab 5: ROI ----
 elif selected_tab == "ROI":
-    total_hr = database.get_time_saved_total()
-    contacted = database.get_outcomes_count("contacted")
-    advanced = database.get_outcomes_count("advancement")
+    roi_totals = database.get_roi_totals()
+    total_hr = roi_totals["total_hours"]
+    contacted = roi_totals["contacted"]
+    advanced = roi_totals["advanced"]
     rev = roi_calculator.revenue_projection(total_hr, contacted, advanced)
     roi_dashboard_card(total_hr, rev, contacted, key_prefix="roi_tab")
     st.markdown("---")
@@ -552,8 +712,8 @@ elif selected_tab == "ROI":
     if by_week:
         # Chart: oldest first for trend left-to-right
         ordered = list(reversed(by_week))
-        try:
-            import plotly.graph_objects as go
+        go = _plotly_go()
+        if go:
             fig = go.Figure(go.Scatter(
                 x=[r["date"] for r in ordered],
                 y=[r["time_saved_hours"] for r in ordered],
@@ -569,14 +729,13 @@ elif selected_tab == "ROI":
                 xaxis_tickangle=-45,
             )
             st.plotly_chart(fig, use_container_width=True, key="roi_trend")
-        except Exception:
+        else:
             st.write("Time saved by day: ", ordered)
     else:
         st.caption("Complete client sessions (Mark as Contacted or Plan Call) to see your time-saved trend here.")
     # Efficiency nudge: this week's time saved vs 10 hr target
     week_start = roi_calculator.get_week_start(datetime.now(timezone.utc))
-    by_day = database.get_time_tracking_by_week(2)
-    this_week_hr = sum(r["time_saved_hours"] for r in by_day if r.get("date") and r["date"] >= week_start)
+    this_week_hr = database.get_time_saved_since(week_start)
     efficiency_pct = min(100.0, (this_week_hr / 10.0) * 100.0) if this_week_hr else 0
     nudge = gentle_nudge_context(efficiency_pct)
     if nudge:
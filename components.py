@@ -5,6 +5,7 @@ Warm coaching aesthetic: cards, kanban, score bars, script boxes, timeline, metr
 import streamlit as st
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from typing import Optional, List, Any, Callable
 
 # ---- Design system ----
@@ -24,7 +25,7 @@ COACHING_CSS = """
 .sandi-coach .metric-card { background: #ffffff; border-radius: 12px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.08); margin-bottom: 16px; }
 .sandi-coach .metric-number { font-size: 36px; font-weight: 700; color: #2c3e50; line-height: 1.2; }
 .sandi-coach .metric-label { font-size: 16px; color: #2c3e50; margin-top: 4px; }
-.sandi-coach .client-card { background: #ffffff; border-radius: 10px; padding: 14px; box-shadow: 0 2px 6px rgba(0,0,0,0.06); margin-bottom: 10px; cursor: pointer; border-left: 4px solid #1976d2; min-height: 44px; display: flex; align-items: center; }
+.sandi-coach .client-card { background: #ffffff; border-radius: 10px; padding: 14px; box-shadow: 0 2px 6px rgba(0,0,0,0.06); margin-bottom: 10px; cursor: pointer; border-left: 4px solid #1976d2; border-bottom: 1px solid #eee; min-height: 44px; display: flex; align-items: center; }
 .sandi-coach .client-card.push-border { border-left-color: #2e7d32; }
 .sandi-coach .client-card.nurture-border { border-left-color: #f57c00; }
 .sandi-coach .client-card.pause-border { border-left-color: #c2185b; }
@@ -52,20 +53,51 @@ COACHING_CSS = """
 HEADER_CSS = COACHING_CSS
 
 
+def _ensure_css() -> None:
+    """Inject COACHING_CSS once per session instead of once per widget.
+
+    app.py re-emits the stylesheet at the top of every rerun, so components
+    only need a fallback injection when used standalone.
+    """
+    if st.session_state.get("_sandi_css_injected"):
+        return
+    st.markdown(COACHING_CSS, unsafe_allow_html=True)
+    st.session_state["_sandi_css_injected"] = True
+
+
+@lru_cache(maxsize=512)
+def _first_name_cached(full_name: str) -> str:
+    s = full_name.strip()
+    if not s:
+        return "Client"
+    head, _, _ = s.partition(" ")
+    return head
+
+
 def first_name_only(full_name: Optional[str]) -> str:
     """Return first name only for display. Never show prospect_id in UI."""
     if not full_name or not isinstance(full_name, str):
         return "Client"
-    return full_name.strip().split()[0] if full_name.strip() else "Client"
+    return _first_name_cached(full_name)
 
 
+@lru_cache(maxsize=None)
 def action_color(action: str) -> str:
     return COLORS.get(action.lower(), COLORS["accent"])
 
 
+# (border class, badge emoji, background color) per recommended action.
+_ACTION_META = {
+    "PUSH": ("push-border", "🎯", COLORS["push"]),
+    "NURTURE": ("nurture-border", "💡", COLORS["nurture"]),
+    "PAUSE": ("pause-border", "🌱", COLORS["pause"]),
+}
+_ACTION_DEFAULT = _ACTION_META["NURTURE"]
+
+
 # ---- Avatar & form (keep for sidebar) ----
 def render_sandi_avatar(show_name: bool = True, status: str = "Ready to help"):
-    st.markdown(COACHING_CSS, unsafe_allow_html=True)
+    _ensure_css()
     st.markdown("🧢")
     if show_name:
         st.markdown('<p class="sandi-coach sandi-header" style="font-size: 22px;">Sandi Bot</p>', unsafe_allow_html=True)
@@ -92,16 +124,27 @@ def render_customer_entry_form(on_start_callback=None):
 
 
 # ---- New components ----
+_METRIC_TMPL = (
+    '<div class="sandi-coach metric-card">'
+    '<div class="metric-number">{number}</div>'
+    '<div class="metric-label">{label}</div></div>'
+)
+_METRIC_TMPL_TREND = (
+    '<div class="sandi-coach metric-card">'
+    '<div class="metric-number">{number}</div>'
+    '<div class="metric-label">{label}</div>'
+    '<div class="metric-label">{trend}</div></div>'
+)
+
+
 def render_insight_metric(number: int, label: str, trend: Optional[str] = None, key: str = "metric"):
     """Big number card for dashboard (e.g. Ready for Decision count)."""
-    st.markdown(COACHING_CSS, unsafe_allow_html=True)
-    trend_html = f'<div class="metric-label">{trend}</div>' if trend else ""
-    st.markdown(
-        f'<div class="sandi-coach metric-card">'
-        f'<div class="metric-number">{number}</div>'
-        f'<div class="metric-label">{label}</div>{trend_html}</div>',
-        unsafe_allow_html=True,
-    )
+    _ensure_css()
+    if trend:
+        html = _METRIC_TMPL_TREND.format(number=number, label=label, trend=trend)
+    else:
+        html = _METRIC_TMPL.format(number=number, label=label)
+    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_client_card(
@@ -121,17 +164,25 @@ def render_client_card(
     days = client.get("compartment_days", 0)
     pid = client.get("prospect_id", "")
     action_lower = (action or "NURTURE").upper()
-    border = "push-border" if action_lower == "PUSH" else "nurture-border" if action_lower == "NURTURE" else "pause-border"
-    badge = "🎯" if action_lower == "PUSH" else "💡" if action_lower == "NURTURE" else "🌱"
+    border, badge, _ = _ACTION_META.get(action_lower, _ACTION_DEFAULT)
     subtitle = f"In stage {comp} for {days} days" + (" – might be stuck" if days > 21 and comp == "Exploration" else "") if show_subtitle else ""
-    with st.container():
-        st.markdown(f"**{first}** · {persona} · {badge} {action_lower}")
-        if show_subtitle and subtitle:
-            st.caption(subtitle)
-        if on_click and pid:
-            if st.button("👁️ View full profile", key=f"{key_prefix}_{pid}", type="secondary"):
-                on_click(pid)
-                st.rerun()
+    sub_html = f'<br/><small>{subtitle}</small>' if subtitle else ""
+    st.markdown(
+        f'<div class="sandi-coach client-card {border}"><span><b>{first}</b> · {persona} · {badge} {action_lower}{sub_html}</span></div>',
+        unsafe_allow_html=True,
+    )
+    if on_click and pid:
+        if st.button("👁️ View full profile", key=f"{key_prefix}_{pid}", type="secondary"):
+            on_click(pid)
+            st.rerun()
+
+
+def _kanban_view_changed(sel_key: str, on_select: Callable[[str], None]) -> None:
+    """on_change callback for a column's View selectbox (fires once per pick)."""
+    pid = st.session_state.get(sel_key)
+    if pid:
+        st.session_state[sel_key] = None  # reset so the same client can be re-picked
+        on_select(pid)
 
 
 def render_pipeline_kanban(
@@ -142,46 +193,71 @@ def render_pipeline_kanban(
 ):
     """
     5-column Kanban by stage. Each card shows first name, persona icon, days, action badge.
-    on_select(prospect_id) when user clicks View profile.
+    on_select(prospect_id) when user picks a client in a column's View profile box.
     """
     stages = ["Discovery", "Exploration", "Serious Consideration", "Decision Prep", "Commitment"]
+    # Bucket once instead of filtering the full list per column (O(N) vs O(N*5)).
+    by_stage = {s: [] for s in stages}
+    for c in clients:
+        bucket = by_stage.get(c.get("compartment"))
+        if bucket is not None:
+            bucket.append(c)
     cols = st.columns(5)
     for idx, stage_name in enumerate(stages):
         with cols[idx]:
             st.markdown(f"**Stage: {stage_name}**")
-            in_stage = [c for c in clients if c.get("compartment") == stage_name]
-            for c in in_stage[:15]:  # cap per column
+            in_stage = by_stage[stage_name][:15]  # cap per column
+            parts = []
+            names = {}
+            for c in in_stage:
                 action = get_action(c)
                 first = first_name_only(c.get("name"))
                 days = c.get("compartment_days", 0)
                 pid = c.get("prospect_id", "")
-                badge = "🎯" if action == "PUSH" else "💡" if action == "NURTURE" else "🌱"
-                st.markdown(f"{first} · {badge} · {days}d")
-                if st.button("View", key=f"{key_prefix}_{pid}_{idx}", type="secondary"):
-                    on_select(pid)
-                    st.rerun()
-                st.markdown("---")
+                names[pid] = first
+                border, badge, _ = _ACTION_META.get(action, _ACTION_DEFAULT)
+                parts.append(f'<div class="sandi-coach client-card {border}">{first} · {badge} · {days}d</div>')
+            if parts:
+                # One markdown per column instead of 2-3 widgets per card.
+                st.markdown("".join(parts), unsafe_allow_html=True)
+                sel_key = f"{key_prefix}_view_{idx}"
+                st.selectbox(
+                    "View profile",
+                    options=list(names),
+                    format_func=lambda pid, n=names: n.get(pid, "Client"),
+                    index=None,
+                    placeholder="View profile…",
+                    key=sel_key,
+                    label_visibility="collapsed",
+                    on_change=_kanban_view_changed,
+                    args=(sel_key, on_select),
+                )
+
+
+# Invariant score-bar markup; only label/width/color/value/note vary per call.
+_SCORE_BAR_TMPL = (
+    '<div class="sandi-coach score-bar-wrap">'
+    '<div class="score-bar-label"><b>{label}</b></div>'
+    '<div class="score-bar-track"><div class="score-bar-fill" style="width:{pct:.0f}%; background:{fill};"></div></div>'
+    '<div class="sandi-coach sandi-body">{v}/5</div>{note}</div>'
+)
+
+
+def _score_bar_html(score: int, label: str, note: Optional[str] = None) -> str:
+    """Build one score bar as an HTML fragment (label, bar, value, optional note)."""
+    v = max(0, min(5, int(score) if score is not None else 0))
+    return _SCORE_BAR_TMPL.format(
+        label=label,
+        pct=(v / 5.0) * 100,
+        fill=score_color(v),
+        v=v,
+        note=f'<div class="score-bar-label" style="color:#9e9e9e; font-size:14px;">{note}</div>' if note else "",
+    )
 
 
 def render_score_visual(score: int, label: str, note: Optional[str] = None, key_prefix: str = "score"):
     """Single horizontal bar: label, score out of 5, optional note."""
-    v = max(0, min(5, int(score) if score is not None else 0))
-    pct = (v / 5.0) * 100
-    if v >= 4:
-        fill_color = COLORS["push"]
-    elif v >= 3:
-        fill_color = COLORS["nurture"]
-    else:
-        fill_color = COLORS["pause"]
-    st.markdown(f"**{label}**")
-    st.markdown(
-        f'<div class="sandi-coach score-bar-wrap">'
-        f'<div class="score-bar-track"><div class="score-bar-fill" style="width:{pct}%; background:{fill_color};"></div></div>'
-        f'<div class="sandi-coach sandi-body">{v}/5</div></div>',
-        unsafe_allow_html=True,
-    )
-    if note:
-        st.caption(note)
+    st.markdown(_score_bar_html(score, label, note), unsafe_allow_html=True)
 
 
 def render_script_box(title: str, script_text: str, key: str = "script"):
@@ -191,28 +267,39 @@ def render_script_box(title: str, script_text: str, key: str = "script"):
         st.caption("Select the text above and copy (Ctrl+C) to use in your call.")
 
 
+_TIMELINE_STEPS = ["Discovery", "Exploration", "Serious Consideration", "Decision Prep", "Commitment"]
+
+
+def _build_timeline_htmls() -> List[str]:
+    # One fully-assembled timeline string per possible current index; only the
+    # index varies at render time.
+    htmls = []
+    for cur in range(len(_TIMELINE_STEPS)):
+        parts = []
+        for i, s in enumerate(_TIMELINE_STEPS):
+            state = "current" if i == cur else "past" if i < cur else "future"
+            parts.append(f'<span class="timeline-step timeline-{state}">{s}</span>')
+        htmls.append('<div class="sandi-coach">' + " → ".join(parts) + "</div>")
+    return htmls
+
+
+_TIMELINE_HTMLS = _build_timeline_htmls()
+
+
 def render_timeline(current_stage: str, days_in_stage: int, key_prefix: str = "timeline"):
     """Visual 5-step progress: Discovery → ... → Commitment, current highlighted. Stuck warning if >21 days."""
-    steps = ["Discovery", "Exploration", "Serious Consideration", "Decision Prep", "Commitment"]
     try:
-        idx = steps.index(current_stage)
+        idx = _TIMELINE_STEPS.index(current_stage)
     except ValueError:
         idx = 0
-    parts = []
-    for i, s in enumerate(steps):
-        if i == idx:
-            parts.append(f'<span class="timeline-step timeline-current">{s}</span>')
-        elif i < idx:
-            parts.append(f'<span class="timeline-step timeline-past">{s}</span>')
-        else:
-            parts.append(f'<span class="timeline-step timeline-future">{s}</span>')
-    st.markdown(COACHING_CSS, unsafe_allow_html=True)
-    st.markdown('<div class="sandi-coach">' + " → ".join(parts) + "</div>", unsafe_allow_html=True)
+    _ensure_css()
+    st.markdown(_TIMELINE_HTMLS[idx], unsafe_allow_html=True)
     st.caption(f"Stage {idx + 1} of 5 · {days_in_stage} days in this stage.")
     if days_in_stage > 21:
         st.warning("⚠️ Over 21 days in this stage – consider a gentle nudge or pause.")
 
 
+@lru_cache(maxsize=None)
 def score_color(score: int) -> str:
     """For legacy compatibility; uses new palette."""
     if score >= 4:
@@ -223,35 +310,48 @@ def score_color(score: int) -> str:
 
 
 def render_score_bars(prospect: dict, key_prefix: str = "score"):
-    """Four horizontal score bars (legacy + new style)."""
+    """Four horizontal score bars (legacy + new style), emitted as one widget."""
     dims = [
         ("Identity", prospect.get("identity_score", 0), "Ownership vs blame"),
         ("Commitment", prospect.get("commitment_score", 0), "Ability to decide"),
         ("Financial", prospect.get("financial_score", 0), "Comfort with money"),
         ("Execution", prospect.get("execution_score", 0), "Follow-through"),
     ]
-    for i, (label, val, note) in enumerate(dims):
-        render_score_visual(val, label, note, f"{key_prefix}_{i}")
+    st.markdown(
+        "".join(_score_bar_html(val, label, note) for label, val, note in dims),
+        unsafe_allow_html=True,
+    )
 
 
-def render_radar_chart(prospect: dict, key: str = "radar"):
-    """Plotly radar for 4 dimensions (kept for optional use)."""
-    try:
-        import plotly.graph_objects as go
-    except Exception:
-        render_score_bars(prospect, key)
-        return
+# Plotly module, resolved on first radar render: None = not yet tried,
+# False = unavailable. Kept lazy so cold start doesn't pay the import.
+_GO = None
+
+
+def _go_module():
+    global _GO
+    if _GO is None:
+        try:
+            import plotly.graph_objects as go
+            _GO = go
+        except Exception:
+            _GO = False
+    return _GO or None
+
+
+@st.cache_resource(show_spinner=False)
+def _build_radar_fig(identity: int, commitment: int, financial: int, execution: int):
+    """Build the radar Figure for a 4-score tuple.
+
+    Cached as a read-only artifact so prospects with unchanged scores reuse
+    the same Figure object instead of rebuilding trace + layout every rerun.
+    """
+    go = _go_module()
     dims = ["Identity", "Commitment", "Financial", "Execution"]
-    vals = [
-        prospect.get("identity_score", 0) or 0,
-        prospect.get("commitment_score", 0) or 0,
-        prospect.get("financial_score", 0) or 0,
-        prospect.get("execution_score", 0) or 0,
-    ]
-    vals = [max(0, min(5, v)) for v in vals]
+    vals = np.array([identity, commitment, financial, execution], dtype=np.float32)
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
-        r=vals + [vals[0]],
+        r=np.concatenate([vals, vals[:1]]),
         theta=dims + [dims[0]],
         fill="toself",
         name="Scores",
@@ -264,8 +364,29 @@ def render_radar_chart(prospect: dict, key: str = "radar"):
         height=280,
         paper_bgcolor="rgba(0,0,0,0)",
         plot_bgcolor="rgba(0,0,0,0)",
+        uirevision="sandi_radar",
     )
-    st.plotly_chart(fig, use_container_width=True, key=key)
+    return fig
+
+
+# The radar is decorative - no zoom/pan/hover needed - so render it as a
+# static SVG with no mode bar or JS event wiring.
+_RADAR_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+
+def render_radar_chart(prospect: dict, key: str = "radar"):
+    """Plotly radar for 4 dimensions (kept for optional use)."""
+    if _go_module() is None:
+        render_score_bars(prospect, key)
+        return
+    vals = np.clip(np.fromiter(
+        (prospect.get(k, 0) or 0 for k in
+         ("identity_score", "commitment_score", "financial_score", "execution_score")),
+        dtype=np.int64, count=4,
+    ), 0, 5)
+    # Plain ints keep the cache key for the figure builder trivially hashable.
+    fig = _build_radar_fig(*(int(v) for v in vals))
+    st.plotly_chart(fig, use_container_width=True, key=key, config=_RADAR_CONFIG)
 
 
 def render_recommendation_card(
@@ -279,7 +400,7 @@ def render_recommendation_card(
 ):
     """Recommendation card with PUSH/NURTURE/PAUSE styling and 👍/👎 (touch-friendly)."""
     action_lower = (action or "NURTURE").upper()
-    bg = COLORS["push"] if action_lower == "PUSH" else COLORS["nurture"] if action_lower == "NURTURE" else COLORS["pause"]
+    _, _, bg = _ACTION_META.get(action_lower, _ACTION_DEFAULT)
     conf_pct = int(round((confidence or 0) * 100))
     st.markdown(
         f'<div class="sandi-coach action-card {action_lower.lower()}" style="background:{bg}; padding:20px; border-radius:12px; color:white; font-size:18px;">'
@@ -289,15 +410,18 @@ def render_recommendation_card(
     st.markdown(f"**Why:** {reason}")
     if script:
         render_script_box("Suggested script", script, f"{key_prefix}_script")
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("👍 Helpful", key=f"{key_prefix}_up"):
-            if on_thumbs_up:
-                on_thumbs_up()
-    with c2:
-        if st.button("👎 Not helpful", key=f"{key_prefix}_down"):
-            if on_thumbs_down:
-                on_thumbs_down()
+    fb_key = f"{key_prefix}_fb"
+    fb = st.feedback("thumbs", key=fb_key)
+    if fb is None:
+        # Deselected: clear the sentinel so re-picking the same value records.
+        st.session_state.pop(f"{fb_key}_seen", None)
+    # Only fire callbacks when the value changes, not on every rerun.
+    if fb is not None and fb != st.session_state.get(f"{fb_key}_seen"):
+        st.session_state[f"{fb_key}_seen"] = fb
+        if fb == 1 and on_thumbs_up:
+            on_thumbs_up()
+        elif fb == 0 and on_thumbs_down:
+            on_thumbs_down()
 
 
 def render_chat_message(role: str, content: str, key: str = None):
@@ -321,7 +445,7 @@ def celebrate_time_saved(hours: float) -> None:
 
 def roi_dashboard_card(time_saved_hours: float, revenue_projection: float, clients_contacted: int, key_prefix: str = "roi") -> None:
     """Three beautiful metric cards: Time saved, $ projected, Clients contacted."""
-    st.markdown(COACHING_CSS, unsafe_allow_html=True)
+    _ensure_css()
     c1, c2, c3 = st.columns(3)
     with c1:
         st.metric("⏱️ Time saved (hrs)", f"{time_saved_hours:.1f}", help="Based on baseline vs actual time in app")
@@ -331,6 +455,7 @@ def roi_dashboard_card(time_saved_hours: float, revenue_projection: float, clien
         st.metric("👤 Clients contacted", str(clients_contacted), help="Marked as contacted this period")
 
 
+@lru_cache(maxsize=256)
 def gentle_nudge_context(efficiency_pct: float) -> Optional[str]:
     """Suggest lead gen research when efficiency > 80%. Returns message or None."""
     if efficiency_pct >= 80:
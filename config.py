@@ -6,12 +6,25 @@ import re
 from typing import Optional
 
 
+# "sk-" prefix plus at least 18 more characters (same as the old
+# startswith/len>20 check, in one C-level scan).
+_SK_RE = re.compile(r"sk-.{18,}", re.DOTALL)
+_LAST_OK: set = set()
+
+
 def validate_openai_key(key: Optional[str]) -> bool:
     """True if key looks like an OpenAI API key (starts with sk-)."""
     if not key or not isinstance(key, str):
         return False
     k = key.strip()
-    return bool(k.startswith("sk-") and len(k) > 20)
+    if k in _LAST_OK:
+        return True
+    if _SK_RE.match(k):
+        if len(_LAST_OK) > 32:
+            _LAST_OK.clear()
+        _LAST_OK.add(k)
+        return True
+    return False
 
 
 def get_api_key_from_session(session_state) -> Optional[str]:
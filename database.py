@@ -5,17 +5,56 @@ CRUD operations and JSON context storage.
 """
 import sqlite3
 import json
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Any
-from datetime import datetime
 
 DB_PATH = Path(__file__).parent / "sandi_bot.db"
 
+# Timestamps are generated inside SQLite (same ISO-8601 "Z" shape the app
+# always wrote) so the hot insert paths skip the Python datetime work and
+# rows in legacy databases without column defaults still get a value.
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ','now')"
+
+# Statements shared by more than one helper, hoisted so sqlite3's prepared-
+# statement cache always sees the identical string.
+_SQL_INSERT_CHAT = (
+    "INSERT INTO chat_history (prospect_id, role, message, context_snapshot, created_at) "
+    f"VALUES (?, ?, ?, ?, {_SQL_NOW})"
+)
+_SQL_INSERT_TIME_TRACKING = (
+    "INSERT INTO time_tracking (prospect_id, activity_type, started_at, ended_at, duration_seconds, "
+    f"baseline_seconds, time_saved_seconds, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, {_SQL_NOW})"
+)
+_SQL_INSERT_OUTCOME = (
+    f"INSERT INTO outcomes (prospect_id, outcome_type, value, notes, created_at) VALUES (?, ?, ?, ?, {_SQL_NOW})"
+)
+
+# One long-lived connection per thread (Streamlit script threads plus the
+# background chat writer). Reuse skips the open/PRAGMA cost per call and
+# keeps SQLite's page cache hot across queries.
+_local = threading.local()
+
 
 def get_connection():
-    """Return a connection to the SQLite database."""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    """Return this thread's long-lived connection (WAL mode, relaxed sync)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        # WAL lets chat writes proceed without blocking readers; NORMAL sync is
+        # safe in WAL mode and avoids an fsync per commit.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 64 MB page cache and mmap'd reads keep hot queries off disk;
+        # busy_timeout covers the writer thread briefly holding the lock.
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        _local.conn = conn
     return conn
 
 
@@ -123,8 +162,17 @@ def init_db():
         )
     """)
 
+    # Covering indexes for the hot filtered/grouped reads. The partial index
+    # on time_tracking matches the completed-session queries
+    # (get_time_tracking_by_week / get_time_saved_since).
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_interactions_pid_time ON interactions(prospect_id, created_at DESC)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_chat_pid_time ON chat_history(prospect_id, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_feedback_type ON feedback(recommendation_type, user_rating)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tt_started ON time_tracking(started_at) WHERE ended_at IS NOT NULL")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_outcomes_type ON outcomes(outcome_type)")
+    cur.execute("ANALYZE")
+
     conn.commit()
-    conn.close()
 
 
 # --- Prospects CRUD ---
@@ -133,18 +181,16 @@ def insert_prospect(record: dict) -> Optional[int]:
     """Insert a single prospect. Returns row id or None."""
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.utcnow().isoformat() + "Z"
-    record.setdefault("created_at", now)
-    record.setdefault("updated_at", now)
     context_json = json.dumps(record.get("context_json")) if isinstance(record.get("context_json"), dict) else record.get("context_json")
     red_flags = json.dumps(record.get("red_flags")) if isinstance(record.get("red_flags"), list) else record.get("red_flags")
-    cur.execute("""
+    cur.execute(f"""
         INSERT INTO prospects (
             prospect_id, name, email, persona, compartment, compartment_days,
             identity_score, commitment_score, financial_score, execution_score,
             conversion_probability, last_interaction_date, red_flags, context_json,
             created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                  COALESCE(?, {_SQL_NOW}), COALESCE(?, {_SQL_NOW}))
     """, (
         record.get("prospect_id"), record.get("name"), record.get("email"),
         record.get("persona"), record.get("compartment"), record.get("compartment_days"),
@@ -155,17 +201,52 @@ def insert_prospect(record: dict) -> Optional[int]:
     ))
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
+def bulk_insert_prospects(records: list) -> int:
+    """Insert many prospects in one transaction (one commit/fsync).
+
+    Rows whose prospect_id already exists are skipped (INSERT OR IGNORE),
+    matching the duplicate-skip behavior of the per-row loader. Returns the
+    number of rows actually inserted.
+    """
+    if not records:
+        return 0
+    conn = get_connection()
+    cur = conn.cursor()
+    params = []
+    for record in records:
+        context_json = json.dumps(record.get("context_json")) if isinstance(record.get("context_json"), dict) else record.get("context_json")
+        red_flags = json.dumps(record.get("red_flags")) if isinstance(record.get("red_flags"), list) else record.get("red_flags")
+        params.append((
+            record.get("prospect_id"), record.get("name"), record.get("email"),
+            record.get("persona"), record.get("compartment"), record.get("compartment_days"),
+            record.get("identity_score"), record.get("commitment_score"),
+            record.get("financial_score"), record.get("execution_score"),
+            record.get("conversion_probability"), record.get("last_interaction_date"),
+            red_flags, context_json, record.get("created_at"), record.get("updated_at")
+        ))
+    before = conn.total_changes
+    cur.executemany(f"""
+        INSERT OR IGNORE INTO prospects (
+            prospect_id, name, email, persona, compartment, compartment_days,
+            identity_score, commitment_score, financial_score, execution_score,
+            conversion_probability, last_interaction_date, red_flags, context_json,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                  COALESCE(?, {_SQL_NOW}), COALESCE(?, {_SQL_NOW}))
+    """, params)
+    conn.commit()
+    return conn.total_changes - before
+
+
 def get_prospect(prospect_id: str) -> Optional[dict]:
     """Fetch one prospect by prospect_id."""
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT * FROM prospects WHERE prospect_id = ?", (prospect_id,))
     row = cur.fetchone()
-    conn.close()
     if row is None:
         return None
     d = dict(row)
@@ -188,7 +269,6 @@ def get_all_prospects() -> list:
     cur = conn.cursor()
     cur.execute("SELECT * FROM prospects ORDER BY prospect_id")
     rows = cur.fetchall()
-    conn.close()
     out = []
     for row in rows:
         d = dict(row)
@@ -206,9 +286,17 @@ def get_all_prospects() -> list:
     return out
 
 
+@lru_cache(maxsize=64)
+def _update_sql(cols: tuple) -> str:
+    """UPDATE statement for a column set; memoized so the same column set
+    reuses one string (and thus one cached prepared statement).
+    updated_at is always stamped inside SQLite."""
+    set_clause = ", ".join(f"{c} = ?" for c in cols)
+    return f"UPDATE prospects SET {set_clause}, updated_at = {_SQL_NOW} WHERE prospect_id = ?"
+
+
 def update_prospect(prospect_id: str, updates: dict) -> bool:
     """Update prospect by prospect_id. Returns True if row was updated."""
-    updates["updated_at"] = datetime.utcnow().isoformat() + "Z"
     if "context_json" in updates and isinstance(updates["context_json"], dict):
         updates["context_json"] = json.dumps(updates["context_json"])
     if "red_flags" in updates and isinstance(updates["red_flags"], list):
@@ -218,30 +306,29 @@ def update_prospect(prospect_id: str, updates: dict) -> bool:
     cols = [k for k in updates if k in (
         "name", "email", "persona", "compartment", "compartment_days",
         "identity_score", "commitment_score", "financial_score", "execution_score",
-        "conversion_probability", "last_interaction_date", "red_flags", "context_json", "updated_at"
+        "conversion_probability", "last_interaction_date", "red_flags", "context_json"
     )]
     if not cols:
-        conn.close()
         return False
-    set_clause = ", ".join(f"{c} = ?" for c in cols)
     vals = [updates[c] for c in cols]
     vals.append(prospect_id)
-    cur.execute(f"UPDATE prospects SET {set_clause} WHERE prospect_id = ?", vals)
+    cur.execute(_update_sql(tuple(cols)), vals)
     ok = cur.rowcount > 0
     conn.commit()
-    conn.close()
     return ok
 
 
 def delete_prospect(prospect_id: str) -> bool:
-    """Delete prospect and related rows. Returns True if deleted."""
+    """Delete prospect and all related rows in one transaction. Returns True if deleted."""
     conn = get_connection()
     cur = conn.cursor()
-    for t in ("feedback", "chat_history", "interactions", "prospects"):
+    for t in ("feedback", "chat_history", "interactions", "time_tracking", "outcomes"):
         cur.execute(f"DELETE FROM {t} WHERE prospect_id = ?", (prospect_id,))
+    cur.execute("DELETE FROM prospects WHERE prospect_id = ?", (prospect_id,))
+    # rowcount of the prospects delete decides the result; child tables may
+    # legitimately be empty.
     ok = cur.rowcount > 0
     conn.commit()
-    conn.close()
     return ok
 
 
@@ -251,14 +338,12 @@ def insert_interaction(prospect_id: str, interaction_type: str, notes: str = "",
     """Log an interaction. Returns new row id."""
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.utcnow().isoformat() + "Z"
     cur.execute(
-        "INSERT INTO interactions (prospect_id, interaction_type, notes, outcome, created_at) VALUES (?, ?, ?, ?, ?)",
-        (prospect_id, interaction_type, notes, outcome, now)
+        f"INSERT INTO interactions (prospect_id, interaction_type, notes, outcome, created_at) VALUES (?, ?, ?, ?, {_SQL_NOW})",
+        (prospect_id, interaction_type, notes, outcome)
     )
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
@@ -271,7 +356,6 @@ def get_interactions(prospect_id: str, limit: int = 50) -> list:
         (prospect_id, limit)
     )
     rows = cur.fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -281,18 +365,36 @@ def insert_chat_message(prospect_id: Optional[str], role: str, message: str, con
     """Append a chat message. context_snapshot stored as JSON. Returns new row id."""
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.utcnow().isoformat() + "Z"
     ctx = json.dumps(context_snapshot) if context_snapshot is not None else None
-    cur.execute(
-        "INSERT INTO chat_history (prospect_id, role, message, context_snapshot, created_at) VALUES (?, ?, ?, ?, ?)",
-        (prospect_id, role, message, ctx, now)
-    )
+    cur.execute(_SQL_INSERT_CHAT, (prospect_id, role, message, ctx))
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
+def insert_chat_messages(rows: list) -> None:
+    """Append several chat messages in one transaction (one commit/fsync).
+
+    Each row is a dict with prospect_id, role, message, and optional
+    context_snapshot (stored as JSON).
+    """
+    if not rows:
+        return
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany(
+        _SQL_INSERT_CHAT,
+        [
+            (
+                r.get("prospect_id"), r["role"], r["message"],
+                json.dumps(r["context_snapshot"]) if r.get("context_snapshot") is not None else None,
+            )
+            for r in rows
+        ]
+    )
+    conn.commit()
+
+
 def get_chat_history(prospect_id: Optional[str], limit: int = 100) -> list:
     """Get recent chat messages, optionally filtered by prospect_id."""
     conn = get_connection()
@@ -305,7 +407,6 @@ def get_chat_history(prospect_id: Optional[str], limit: int = 100) -> list:
     else:
         cur.execute("SELECT * FROM chat_history ORDER BY created_at ASC LIMIT ?", (limit,))
     rows = cur.fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -315,14 +416,12 @@ def insert_feedback(prospect_id: Optional[str], recommendation_type: str, user_r
     """Record thumbs up (1) or down (0). Returns new row id."""
     conn = get_connection()
     cur = conn.cursor()
-    now = datetime.utcnow().isoformat() + "Z"
     cur.execute(
-        "INSERT INTO feedback (prospect_id, recommendation_type, user_rating, message_id, created_at) VALUES (?, ?, ?, ?, ?)",
-        (prospect_id, recommendation_type, user_rating, message_id, now)
+        f"INSERT INTO feedback (prospect_id, recommendation_type, user_rating, message_id, created_at) VALUES (?, ?, ?, ?, {_SQL_NOW})",
+        (prospect_id, recommendation_type, user_rating, message_id)
     )
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
@@ -340,7 +439,6 @@ def get_feedback_stats(recommendation_type: Optional[str] = None) -> dict:
             "SELECT COUNT(*) as total, SUM(CASE WHEN user_rating = 1 THEN 1 ELSE 0 END) as positive FROM feedback"
         )
     row = cur.fetchone()
-    conn.close()
     total = row["total"] or 0
     positive = row["positive"] or 0
     return {"total": total, "positive": positive, "negative": total - positive}
@@ -351,27 +449,69 @@ def get_feedback_stats(recommendation_type: Optional[str] = None) -> dict:
 def insert_time_tracking(prospect_id: str, activity_type: str, started_at: str, ended_at: Optional[str] = None,
                         duration_seconds: Optional[float] = None, baseline_seconds: Optional[float] = None,
                         time_saved_seconds: Optional[float] = None) -> int:
-    now = datetime.utcnow().isoformat() + "Z"
     conn = get_connection()
     cur = conn.cursor()
     cur.execute(
-        """INSERT INTO time_tracking (prospect_id, activity_type, started_at, ended_at, duration_seconds,
-           baseline_seconds, time_saved_seconds, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (prospect_id, activity_type, started_at, ended_at, duration_seconds, baseline_seconds, time_saved_seconds, now)
+        _SQL_INSERT_TIME_TRACKING,
+        (prospect_id, activity_type, started_at, ended_at, duration_seconds, baseline_seconds, time_saved_seconds)
     )
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
+def record_session_activity(prospect_id: str, activity_type: str, started_at: str, ended_at: Optional[str] = None,
+                            duration_seconds: Optional[float] = None, baseline_seconds: Optional[float] = None,
+                            time_saved_seconds: Optional[float] = None, outcome_type: Optional[str] = None) -> dict:
+    """Insert a time_tracking row (plus optional outcome) and read the ROI
+    aggregates on one connection instead of five round-trips.
+
+    Returns {"total_hours", "contacted", "advanced", "usage_dates"}.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        _SQL_INSERT_TIME_TRACKING,
+        (prospect_id, activity_type, started_at, ended_at, duration_seconds, baseline_seconds, time_saved_seconds)
+    )
+    if outcome_type:
+        cur.execute(_SQL_INSERT_OUTCOME, (prospect_id, outcome_type, 1, None))
+    conn.commit()
+    totals = _roi_aggregates(cur)
+    cur.execute("SELECT DISTINCT date(created_at) as d FROM time_tracking ORDER BY d DESC LIMIT 30")
+    totals["usage_dates"] = [row["d"] for row in cur.fetchall() if row["d"]]
+    return totals
+
+
+def _roi_aggregates(cur) -> dict:
+    """Total hours saved plus contacted/advancement counts on an open cursor."""
+    cur.execute("SELECT COALESCE(SUM(time_saved_seconds), 0) as total FROM time_tracking")
+    total_hours = (cur.fetchone()["total"] or 0) / 3600.0
+    cur.execute(
+        "SELECT outcome_type, COUNT(*) as c FROM outcomes WHERE outcome_type IN ('contacted', 'advancement') GROUP BY outcome_type"
+    )
+    counts = {row["outcome_type"]: row["c"] for row in cur.fetchall()}
+    return {
+        "total_hours": total_hours,
+        "contacted": counts.get("contacted", 0),
+        "advanced": counts.get("advancement", 0),
+    }
+
+
+def get_roi_totals() -> dict:
+    """One-connection replacement for polling get_time_saved_total plus two
+    get_outcomes_count calls. Returns {"total_hours", "contacted", "advanced"}."""
+    conn = get_connection()
+    totals = _roi_aggregates(conn.cursor())
+    return totals
+
+
 def get_time_saved_total() -> float:
     """Total time_saved_seconds across all records (for display as hours)."""
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT COALESCE(SUM(time_saved_seconds), 0) as total FROM time_tracking")
     row = cur.fetchone()
-    conn.close()
     return (row["total"] or 0) / 3600.0
 
 
@@ -385,33 +525,38 @@ def get_time_tracking_by_week(weeks: int = 12) -> list:
         GROUP BY date(started_at) ORDER BY d DESC LIMIT ?
     """, (weeks * 7,))
     rows = cur.fetchall()
-    conn.close()
     return [{"date": row["d"], "time_saved_hours": round(row["hours"] or 0, 2)} for row in rows]
 
 
+def get_time_saved_since(date_str: str) -> float:
+    """Hours saved from completed sessions on or after date_str (YYYY-MM-DD)."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT COALESCE(SUM(time_saved_seconds), 0) as total FROM time_tracking WHERE ended_at IS NOT NULL AND date(started_at) >= ?",
+        (date_str,)
+    )
+    row = cur.fetchone()
+    return (row["total"] or 0) / 3600.0
+
+
 def get_usage_dates() -> list:
     """Distinct dates (YYYY-MM-DD) when any time_tracking activity was recorded (for consecutive-day count)."""
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("SELECT DISTINCT date(created_at) as d FROM time_tracking ORDER BY d DESC LIMIT 30")
     rows = cur.fetchall()
-    conn.close()
     return [row["d"] for row in rows if row["d"]]
 
 
 # --- Outcomes ---
 
 def insert_outcome(prospect_id: str, outcome_type: str, value: Optional[float] = None, notes: Optional[str] = None) -> int:
-    now = datetime.utcnow().isoformat() + "Z"
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO outcomes (prospect_id, outcome_type, value, notes, created_at) VALUES (?, ?, ?, ?, ?)",
-        (prospect_id, outcome_type, value or 0, notes, now)
-    )
+    cur.execute(_SQL_INSERT_OUTCOME, (prospect_id, outcome_type, value or 0, notes))
     row_id = cur.lastrowid
     conn.commit()
-    conn.close()
     return row_id
 
 
@@ -423,7 +568,6 @@ def get_outcomes_count(outcome_type: Optional[str] = None) -> int:
     else:
         cur.execute("SELECT COUNT(*) as c FROM outcomes")
     row = cur.fetchone()
-    conn.close()
     return row["c"] or 0
 
 
@@ -435,21 +579,19 @@ def has_any_advancement() -> bool:
 
 def upsert_weekly_roi(week_start_date: str, time_saved_hours: float = 0, revenue_projection: float = 0,
                      clients_contacted: int = 0, clients_advanced: int = 0) -> None:
-    now = datetime.utcnow().isoformat() + "Z"
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute("""
+    cur.execute(f"""
         INSERT INTO weekly_roi (week_start_date, time_saved_hours, revenue_projection, clients_contacted, clients_advanced, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, {_SQL_NOW}, {_SQL_NOW})
         ON CONFLICT(week_start_date) DO UPDATE SET
             time_saved_hours = excluded.time_saved_hours,
             revenue_projection = excluded.revenue_projection,
             clients_contacted = excluded.clients_contacted,
             clients_advanced = excluded.clients_advanced,
             updated_at = excluded.updated_at
-    """, (week_start_date, time_saved_hours, revenue_projection, clients_contacted, clients_advanced, now, now))
+    """, (week_start_date, time_saved_hours, revenue_projection, clients_contacted, clients_advanced))
     conn.commit()
-    conn.close()
 
 
 def get_weekly_roi(weeks: int = 12) -> list:
@@ -457,5 +599,4 @@ def get_weekly_roi(weeks: int = 12) -> list:
     cur = conn.cursor()
     cur.execute("SELECT * FROM weekly_roi ORDER BY week_start_date DESC LIMIT ?", (weeks,))
     rows = cur.fetchall()
-    conn.close()
     return [dict(r) for r in rows]
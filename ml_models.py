@@ -92,6 +92,23 @@ class SandiML:
         p = (avg / 5.0) * 0.5 + stage_bonus * 0.5 - stall_penalty
         return round(max(0.0, min(1.0, p)), 3)
 
+    def build_neighbor_index(self, prospects: List[dict], top_n: int = 10) -> dict:
+        """Precompute top-N nearest neighbor ids for every prospect in one batched pass.
+
+        Returns {prospect_id: [neighbor_prospect_ids...]}. One all-pairs distance
+        computation replaces N per-query scans in get_similar_prospects.
+        """
+        if not prospects:
+            return {}
+        ids = [p.get("prospect_id") for p in prospects]
+        if not self._fitted:
+            return {pid: [other for other in ids if other != pid][:top_n] for pid in ids}
+        X_scaled = self.scaler.transform(_build_feature_matrix(prospects))
+        dists = np.linalg.norm(X_scaled[:, None, :] - X_scaled[None, :, :], axis=2)
+        np.fill_diagonal(dists, np.inf)
+        order = np.argsort(dists, axis=1)[:, :top_n]
+        return {ids[i]: [ids[j] for j in order[i]] for i in range(len(ids))}
+
     def get_similar_prospects(self, prospects: List[dict], reference: dict, top_n: int = 10) -> List[dict]:
         if not prospects or not self._fitted:
             return prospects[:top_n]
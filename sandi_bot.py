@@ -163,11 +163,20 @@ def get_recommendation(prospect: dict) -> Tuple[str, float, str]:
     return _recommend_action(prospect)
 
 
+# Memo for get_tactics: at most len(personas) x len(actions) distinct keys.
+_TACTICS_CACHE: Dict[Tuple[str, str], List[str]] = {}
+
+
 def get_tactics(persona: str, action: str) -> List[str]:
     """Return list of tactic scripts for persona + action."""
-    p = TACTICS_DB.get(persona) or TACTICS_DB.get(DEFAULT_PERSONA)
-    tactics = (p or {}).get(action, [])
-    return tactics if tactics else ["Continue the conversation and ask for one clear next step."]
+    key = (persona, action)
+    cached = _TACTICS_CACHE.get(key)
+    if cached is None:
+        p = TACTICS_DB.get(persona) or TACTICS_DB.get(DEFAULT_PERSONA)
+        tactics = (p or {}).get(action, [])
+        cached = tactics if tactics else ["Continue the conversation and ask for one clear next step."]
+        _TACTICS_CACHE[key] = cached
+    return cached
 
 
 def recommend_advancement(prospect: dict) -> Tuple[bool, str]:
@@ -185,15 +185,9 @@ def generate_all_prospects(count: int = 100) -> list:
 def load_synthetic_into_db(records: list) -> int:
     """Insert all records into DB. Creates DB if needed. Returns number inserted."""
     database.init_db()
-    n = 0
-    for r in records:
-        try:
-            database.insert_prospect(r)
-            n += 1
-        except Exception:
-            # Skip duplicates
-            pass
-    return n
+    # One batched transaction instead of a commit per row; duplicates are
+    # skipped inside bulk_insert_prospects.
+    return database.bulk_insert_prospects(records)
 
 
 def ensure_synthetic_data():